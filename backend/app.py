@@ -16,19 +16,19 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///cooking_app_final.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URL", 'sqlite:///cooking_app_final.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 
 # --- 云服务客户端配置 ---
 DOUBAO_API_KEY = os.getenv("DOUBAO_API_KEY")
-DOUBAO_API_URL = "https://ark.cn-beijing.volces.com/api/v3/chat/completions"  # 豆包API实际地址可能需要调整
+DOUBAO_API_URL = os.getenv("DOUBAO_API_URL", "https://ark.cn-beijing.volces.com/api/v3/chat/completions")  # 豆包API实际地址可能需要调整
 
 # 百度语音识别配置
 BAIDU_ASR_API_KEY = os.getenv("BAIDU_ASR_API_KEY")
 BAIDU_ASR_SECRET_KEY = os.getenv("BAIDU_ASR_SECRET_KEY")
-BAIDU_ASR_TOKEN_URL = "https://aip.baidubce.com/oauth/2.0/token"
-BAIDU_ASR_URL = "https://vop.baidu.com/server_api"
+BAIDU_ASR_TOKEN_URL = os.getenv("BAIDU_ASR_TOKEN_URL", "https://aip.baidubce.com/oauth/2.0/token")
+BAIDU_ASR_URL = os.getenv("BAIDU_ASR_URL", "https://vop.baidu.com/server_api")
 
 # --- 2. 数据库模型定义 ---
 
@@ -0,0 +1,9 @@
+"""
+四时后端性能基准测试套件
+
+upstream_stub  本地模拟豆包 / 百度语音识别接口
+seed_data      批量生成 Recipe / KnowledgeItem / PantryItem 测试数据
+server         以无重载、多线程方式启动 app.py 供压测使用
+run            按场景压测并输出 JSON 结果
+compare        对比两次压测结果
+"""
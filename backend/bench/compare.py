@@ -0,0 +1,137 @@
+"""
+对比两次压测结果
+
+  python -m bench.compare bench/results/old.json bench/results/new.json
+  python -m bench.compare old.json new.json --fail-on-regression 10
+  python -m bench.compare old.json new.json --fail-on-regression 10 --fail-on-rate-increase 0.5
+
+指定任一阈值即开启回退检查，出现回退时以非零状态码退出，便于在 CI 中使用：
+  --fail-on-regression PCT     吞吐、延迟、内存等指标的相对变差阈值（%）
+  --fail-on-rate-increase PP   error_rate、degraded_rate 等比例类指标的上升阈值（百分点），默认 1
+比例类指标按绝对差值计算，因此基准为 0 时出现的错误同样会被判定为回退。
+"""
+
+import argparse
+import json
+import sys
+
+DEFAULT_RATE_INCREASE_PP = 1.0
+
+# (指标名, 取值函数, 数值越大越好, 是否为比例类指标)
+# 数值越大越好为 None 的指标仅作展示，不参与回退判定
+METRICS = [
+    ("throughput_rps", lambda r: r["throughput_rps"], True, False),
+    ("p50_ms", lambda r: r["latency_ms"]["p50"], False, False),
+    ("p95_ms", lambda r: r["latency_ms"]["p95"], False, False),
+    ("p99_ms", lambda r: r["latency_ms"]["p99"], False, False),
+    ("error_rate", lambda r: r["error_rate"], False, True),
+    # 上游失败但接口以兜底内容返回 200 的比例（如 storage_tips 的 "暂无建议"）
+    ("degraded_rate", lambda r: r.get("degraded_rate"), False, True),
+    ("peak_rss_mb", lambda r: r["peak_rss_mb"], False, False),
+    # 命中率变化说明查询结果变了，此时延迟变化不能直接视为性能变化
+    ("non_empty_rate", lambda r: r.get("non_empty_rate"), None, True),
+]
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def change_pct(old, new, is_rate=False):
+    """相对变化百分比；比例类指标返回绝对差值（百分点），避免基准为 0 时无法比较"""
+    if old is None or new is None:
+        return None
+    if is_rate:
+        return (new - old) * 100.0
+    if old == 0:
+        return 0.0 if new == 0 else None
+    return (new - old) / old * 100.0
+
+
+def compare(baseline, candidate):
+    """
+    返回每个场景各项指标的 {old, new, change_pct, regression_pct, unit}
+    regression_pct 为正表示变差，unit 为 "%"（相对变化）或 "pp"（百分点）
+    """
+    rows = {}
+    for name in baseline["scenarios"]:
+        if name not in candidate["scenarios"]:
+            continue
+        old_result, new_result = baseline["scenarios"][name], candidate["scenarios"][name]
+        rows[name] = {}
+        for metric, getter, higher_is_better, is_rate in METRICS:
+            old, new = getter(old_result), getter(new_result)
+            pct = change_pct(old, new, is_rate)
+            if pct is None or higher_is_better is None:
+                regression = None
+            else:
+                regression = -pct if higher_is_better else pct
+            rows[name][metric] = {"old": old, "new": new, "change_pct": pct, "regression_pct": regression,
+                                  "unit": "pp" if is_rate else "%"}
+    return rows
+
+
+def find_regressions(rows, max_regression_pct=None, max_rate_increase_pp=DEFAULT_RATE_INCREASE_PP):
+    """
+    返回超过阈值的 (场景, 指标, 变差幅度, 单位) 列表
+    相对指标与 max_regression_pct（%）比较，比例类指标与 max_rate_increase_pp（百分点）比较，阈值为 None 时不检查
+    """
+    regressions = []
+    for name, metrics in rows.items():
+        for metric, row in metrics.items():
+            threshold = max_rate_increase_pp if row["unit"] == "pp" else max_regression_pct
+            if threshold is None or row["regression_pct"] is None:
+                continue
+            if row["regression_pct"] > threshold:
+                regressions.append((name, metric, row["regression_pct"], row["unit"]))
+    return regressions
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比两次压测结果")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--fail-on-regression", type=float, default=None, metavar="PCT",
+                        help="吞吐、延迟、内存等指标相对变差超过 PCT%% 时失败")
+    parser.add_argument("--fail-on-rate-increase", type=float, default=None, metavar="PP",
+                        help=f"error_rate 等比例类指标上升超过 PP 个百分点时失败，开启回退检查时默认 {DEFAULT_RATE_INCREASE_PP}")
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出对比结果")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    rows = compare(baseline, candidate)
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print(f"基准: {args.baseline} ({baseline.get('git_revision')})")
+        print(f"对比: {args.candidate} ({candidate.get('git_revision')})")
+        if baseline.get("config") != candidate.get("config"):
+            print("注意: 两次运行的压测配置不同，结果可能不可比")
+        print()
+        header = f"{'场景':<16}{'指标':<16}{'基准':>12}{'对比':>12}{'变化':>10}"
+        print(header)
+        print("-" * len(header))
+        for name, metrics in rows.items():
+            for metric, row in metrics.items():
+                pct = "-" if row["change_pct"] is None else f"{row['change_pct']:+.1f}{row['unit']}"
+                print(f"{name:<16}{metric:<16}{_fmt(row['old']):>12}{_fmt(row['new']):>12}{pct:>10}")
+
+    if args.fail_on_regression is not None or args.fail_on_rate_increase is not None:
+        rate_threshold = DEFAULT_RATE_INCREASE_PP if args.fail_on_rate_increase is None else args.fail_on_rate_increase
+        regressions = find_regressions(rows, args.fail_on_regression, rate_threshold)
+        for name, metric, pct, unit in regressions:
+            print(f"性能回退: {name}.{metric} 变差 {pct:.1f}{unit}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+端到端压测入口
+
+流程：启动上游模拟服务 -> 生成压测数据库 -> 每个场景单独启动一个后端进程并压测
+-> 输出吞吐量、p50/p95/p99 延迟与后端进程峰值内存（JSON）。
+
+在 backend 目录下运行：
+  python -m bench.run
+  python -m bench.run --scenarios recommend knowledge_list --concurrency 16 --requests 2000
+  python -m bench.run --doubao-latency-ms 300 --jitter-ms 100 --error-rate 0.05 --output bench/results/slow.json
+
+结果文件可用 `python -m bench.compare old.json new.json` 对比。
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from bench import seed_data, upstream_stub
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "bench", "results")
+RESULT_VERSION = 1
+
+
+# --- 场景定义 ---
+# 每个场景是一个函数：接收 (rng, options)，返回 (method, path, requests 关键字参数)
+
+def scenario_recommend(rng, options):
+    ingredients = rng.sample(seed_data.INGREDIENTS, rng.randint(1, 3))
+    return "POST", "/api/recipe/recommend", {"json": {"ingredients": ingredients}}
+
+
+def scenario_storage_tips(rng, options):
+    ingredients = rng.sample(seed_data.INGREDIENTS, options["tips_ingredients"])
+    return "POST", "/api/pantry/storage_tips", {"json": {"ingredients": ingredients}}
+
+
+def scenario_voice_recognize(rng, options):
+    files = {"audio": ("recording.pcm", options["audio"], "application/octet-stream")}
+    return "POST", "/api/pantry/voice_recognize", {"files": files}
+
+
+def scenario_knowledge_list(rng, options):
+    return "GET", "/api/knowledge/items", {}
+
+
+SCENARIOS = {
+    "recommend": scenario_recommend,
+    "storage_tips": scenario_storage_tips,
+    "voice_recognize": scenario_voice_recognize,
+    "knowledge_list": scenario_knowledge_list,
+}
+
+
+# --- 响应检查 ---
+# 计时结束后解析响应体，返回 {"results": 结果条数或 None, "degraded": 是否为降级响应}
+
+def inspect_recommend(body):
+    # app.py 以 ensure_ascii 的 JSON 存储食材，LIKE '%"土豆"%' 匹配不到转义后的中文，
+    # 默认数据下推荐结果恒为空，只测到全表扫描且无命中的路径；以命中率区分两种情况
+    return {"results": len(body), "degraded": False}
+
+
+def inspect_storage_tips(body):
+    # 上游调用失败时 app.py 仍返回 200，并以 "暂无建议" 兜底，这类响应计为降级
+    degraded = any(isinstance(tip, dict) and tip.get("method") == "暂无建议" for tip in body.values())
+    return {"results": None, "degraded": degraded}
+
+
+RESPONSE_INSPECTORS = {
+    "recommend": inspect_recommend,
+    "storage_tips": inspect_storage_tips,
+}
+
+
+# --- 统计 ---
+
+def percentile(sorted_values, pct):
+    """最近秩法计算百分位数，sorted_values 需已排序"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples, elapsed):
+    inspected = [s for s in samples if s["results"] is not None]
+    degraded = sum(1 for s in samples if s["degraded"])
+    latencies = sorted(s["latency_ms"] for s in samples)
+    errors = [s for s in samples if s["error"]]
+    statuses = {}
+    for s in samples:
+        key = str(s["status"]) if s["status"] is not None else "exception"
+        statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "min": round(latencies[0], 3) if latencies else None,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50": round(percentile(latencies, 50), 3) if latencies else None,
+            "p95": round(percentile(latencies, 95), 3) if latencies else None,
+            "p99": round(percentile(latencies, 99), 3) if latencies else None,
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+        "response_bytes_mean": round(sum(s["bytes"] for s in samples) / len(samples), 1) if samples else 0.0,
+        "status_codes": statuses,
+        # 有结果列表的场景才统计命中情况，便于区分性能变化与查询命中率变化
+        "result_count_mean": round(sum(s["results"] for s in inspected) / len(inspected), 2) if inspected else None,
+        "non_empty_rate": round(sum(1 for s in inspected if s["results"]) / len(inspected), 4) if inspected else None,
+        "degraded": degraded,
+        "degraded_rate": round(degraded / len(samples), 4) if samples else 0.0,
+    }
+
+
+def read_process_memory(pid):
+    """从 /proc 读取进程峰值 / 当前常驻内存（MB），非 Linux 平台返回 None"""
+    path = f"/proc/{pid}/status"
+    if not os.path.exists(path):
+        return {"peak_rss_mb": None, "rss_mb": None}
+    values = {}
+    with open(path) as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("VmHWM", "VmRSS"):
+                values[key] = round(int(rest.split()[0]) / 1024.0, 2)
+    return {"peak_rss_mb": values.get("VmHWM"), "rss_mb": values.get("VmRSS")}
+
+
+# --- 后端进程管理 ---
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_backend(env, port, timeout=30):
+    # 错误日志写入临时文件而非管道，避免管道写满阻塞后端进程
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "bench.server", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=log,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                log.seek(0)
+                raise RuntimeError(f"后端进程启动失败: {log.read().decode('utf-8', 'replace')}")
+            try:
+                requests.get(base_url + "/api/user/location", timeout=1)
+                return proc, base_url
+            except requests.exceptions.RequestException:
+                # 连接被拒绝或冷启动时首个响应超时，均视为尚未就绪
+                time.sleep(0.1)
+        raise RuntimeError("后端进程启动超时")
+    except BaseException:
+        # 任何异常（包括 Ctrl+C）都不能留下孤儿后端进程
+        stop_backend(proc)
+        raise
+    finally:
+        log.close()
+
+
+def stop_backend(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# --- 压测执行 ---
+
+def run_load(base_url, scenario, options, total, concurrency, warmup, seed, before_measure=None, inspector=None):
+    """
+    闭环压测：concurrency 个线程共同完成 total 个请求，预热结束后调用 before_measure
+    inspector 用于在计时之外检查成功响应的内容
+    """
+    tickets = itertools.count()
+    samples = []
+    samples_lock = threading.Lock()
+
+    def worker(index, count_limit, record):
+        rng = random.Random(f"{seed}-{index}")
+        session = requests.Session()
+        local = []
+        while next(tickets) < count_limit:
+            method, path, kwargs = scenario(rng, options)
+            start = time.perf_counter()
+            status, size, error, response = None, 0, False, None
+            try:
+                response = session.request(method, base_url + path, timeout=options["timeout"], **kwargs)
+                status, size = response.status_code, len(response.content)
+                error = status >= 400
+            except requests.exceptions.RequestException:
+                error = True
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            info = {"results": None, "degraded": False}
+            if inspector and response is not None and not error:
+                try:
+                    info = inspector(response.json())
+                except ValueError:
+                    pass
+            local.append(dict(info, latency_ms=latency_ms, status=status, bytes=size, error=error))
+        session.close()
+        if record:
+            with samples_lock:
+                samples.extend(local)
+
+    def run_phase(count_limit, record):
+        threads = [threading.Thread(target=worker, args=(i, count_limit, record)) for i in range(concurrency)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - start
+
+    if warmup:
+        run_phase(warmup, record=False)
+        tickets = itertools.count()
+    if before_measure:
+        before_measure()
+    elapsed = run_phase(total, record=True)
+    return samples, elapsed
+
+
+def run_scenario(name, args, options, env, stub, seed):
+    port = free_port()
+    proc, base_url = start_backend(env, port)
+    try:
+        samples, elapsed = run_load(base_url, SCENARIOS[name], options, args.requests, args.concurrency,
+                                    args.warmup, seed, before_measure=stub.reset_stats,
+                                    inspector=RESPONSE_INSPECTORS.get(name))
+        result = summarize(samples, elapsed)
+        result.update(read_process_memory(proc.pid))
+        result["upstream_calls"] = stub.snapshot_stats()
+        return result
+    finally:
+        stop_backend(proc)
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_summary(results):
+    header = f"{'场景':<16}{'请求':>8}{'错误':>8}{'降级':>8}{'吞吐(rps)':>12}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'峰值RSS(MB)':>14}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        lat = r["latency_ms"]
+        print(f"{name:<16}{r['requests']:>8}{r['errors']:>8}{r['degraded']:>8}{r['throughput_rps']:>12}"
+              f"{str(lat['p50']):>10}{str(lat['p95']):>10}{str(lat['p99']):>10}{str(r['peak_rss_mb']):>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="四时后端端到端压测")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="每个场景的请求总数")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20, help="每个场景正式计时前的预热请求数")
+    parser.add_argument("--timeout", type=float, default=60.0, help="单个请求的超时时间（秒）")
+    parser.add_argument("--tips-ingredients", type=int, default=3, help="storage_tips 每次请求的食材数量")
+    parser.add_argument("--audio-seconds", type=float, default=2.0, help="voice_recognize 上传的 16kHz PCM 音频时长")
+    parser.add_argument("--database", default=os.path.join(RESULTS_DIR, "bench.db"))
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="复用已有的压测数据库及其 manifest，显式传入的生成参数须与 manifest 一致")
+    parser.add_argument("--output", help="结果 JSON 路径，默认 bench/results/<时间戳>.json")
+    parser.add_argument("--label", help="本次运行的备注，写入结果文件")
+    # 不设默认值，以便在复用数据库时识别与 manifest 冲突的显式参数
+    seed_data.add_seed_arguments(parser, with_defaults=False)
+    upstream_stub.add_config_arguments(parser)
+    args = parser.parse_args()
+    if args.requests < 1:
+        parser.error("--requests 必须大于 0")
+    if args.concurrency < 1:
+        parser.error("--concurrency 必须大于 0")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    database = os.path.abspath(args.database)
+    os.makedirs(os.path.dirname(database), exist_ok=True)
+
+    requested = seed_data.params_from_args(args)
+    reuse = args.skip_seed and os.path.exists(database)
+    if reuse:
+        manifest = seed_data.load_manifest(database)
+        if manifest is None:
+            parser.error(f"{database} 缺少 manifest，无法确认数据内容，请去掉 --skip-seed 重新生成")
+        data_params = manifest["params"]
+        conflicts = [f"{key}={value}（manifest 中为 {data_params.get(key)}）"
+                     for key, value in requested.items() if data_params.get(key) != value]
+        if conflicts:
+            parser.error("生成参数与已有数据库不一致: " + "，".join(conflicts))
+    else:
+        data_params = dict(seed_data.DEFAULT_PARAMS, **requested)
+
+    stub_config = upstream_stub.config_from_args(args)
+    stub = upstream_stub.start_in_thread(config=stub_config)
+    env = dict(os.environ, **upstream_stub.upstream_env(stub.base_url))
+    env["DATABASE_URL"] = seed_data.sqlite_url(database)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    if reuse:
+        print(f"复用压测数据库 {database}: {data_params}")
+    else:
+        print(f"正在生成压测数据库 {database} ...")
+        # 在子进程中生成，避免本进程导入 app 后占用数据库连接
+        subprocess.run(
+            [sys.executable, "-m", "bench.seed_data", "--database", database] + seed_data.params_to_argv(data_params),
+            cwd=BACKEND_DIR, env=env, check=True,
+        )
+
+    options = {
+        "timeout": args.timeout,
+        "tips_ingredients": args.tips_ingredients,
+        # 16kHz、16bit、单声道 PCM
+        "audio": random.Random(data_params["seed"]).randbytes(int(args.audio_seconds * 16000 * 2)),
+    }
+
+    results = {}
+    try:
+        for name in args.scenarios:
+            print(f"压测场景 {name} ...")
+            results[name] = run_scenario(name, args, options, env, stub, data_params["seed"])
+    finally:
+        stub.shutdown()
+        stub.server_close()
+
+    report = {
+        "version": RESULT_VERSION,
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "tips_ingredients": args.tips_ingredients,
+            "audio_seconds": args.audio_seconds,
+            "seed": data_params["seed"],
+            # 复用数据库时取自 manifest，保证记录的是实际压测的数据
+            "data": data_params,
+            "upstream": stub_config,
+        },
+        "scenarios": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print()
+    print_summary(results)
+    print(f"\n结果已写入 {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+压测数据生成
+
+向独立的 SQLite 数据库批量写入 Recipe / KnowledgeItem / PantryItem，
+字段格式与 app.py 中对应接口写入的数据保持一致。
+注意 app.py 用默认的 json.dumps 存储菜谱食材，中文会被转义为 \\uXXXX，
+/api/recipe/recommend 的 LIKE 查询因此匹配不到任何菜谱。--recipe-unescaped-ratio
+可让一部分菜谱以未转义的形式写入，用于压测有命中结果的推荐路径。
+生成参数会写入数据库旁的 <数据库>.manifest.json，复用数据库时以此为准。单独运行：
+  python -m bench.seed_data --database bench/results/bench.db --recipes 50000
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+from datetime import date, datetime, timedelta
+
+INGREDIENTS = [
+    "土豆", "西红柿", "鸡蛋", "青椒", "洋葱", "胡萝卜", "白菜", "豆腐", "猪肉", "牛肉",
+    "鸡胸肉", "三文鱼", "鳕鱼", "虾仁", "蘑菇", "黄瓜", "茄子", "西兰花", "大蒜", "生姜",
+    "葱", "香菜", "米饭", "面条", "玉米", "南瓜", "芹菜", "菠菜", "莲藕", "山药",
+]
+SEASONINGS = ["盐", "酱油", "老抽", "醋", "糖", "料酒", "蚝油", "豆瓣酱", "花椒", "八角", "辣椒粉", "芝麻油"]
+DISH_SUFFIXES = ["炒", "炖", "烧", "蒸", "拌", "焖", "煎"]
+BATCH_SIZE = 2000
+
+DEFAULT_COUNTS = {
+    "recipes": 20000,
+    "knowledge": 5000,
+    "pantry": 2000,
+}
+
+# 决定数据库内容的全部生成参数，键名与命令行参数一一对应
+DEFAULT_PARAMS = dict(DEFAULT_COUNTS, seed=42, image_ratio=0.2, image_bytes=2048, recipe_unescaped_ratio=0.0)
+
+
+def sqlite_url(path):
+    return "sqlite:///" + os.path.abspath(path)
+
+
+def manifest_path(database):
+    return os.path.abspath(database) + ".manifest.json"
+
+
+def load_manifest(database):
+    """读取数据库的生成参数，不存在时返回 None"""
+    path = manifest_path(database)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(database, params, written):
+    manifest = {"params": params, "written": written, "created_at": datetime.now().isoformat(timespec="seconds")}
+    with open(manifest_path(database), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def _batched(rows, size=BATCH_SIZE):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _recipe_rows(rng, count, unescaped_ratio=0.0):
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        picked = rng.sample(INGREDIENTS, rng.randint(2, 6)) + rng.sample(SEASONINGS, rng.randint(1, 3))
+        rows.append({
+            "name": f"{picked[0]}{rng.choice(DISH_SUFFIXES)}{picked[1]} #{i}",
+            "ingredients": json.dumps(picked, ensure_ascii=rng.random() >= unescaped_ratio),
+            "steps": "；".join(f"{n + 1}. 处理{item}" for n, item in enumerate(picked)),
+            "source": rng.choice(["manual", "ai"]),
+            "created_at": now - timedelta(seconds=i),
+        })
+    return rows
+
+
+def _knowledge_rows(rng, count, image_ratio, image_bytes):
+    now = datetime.utcnow()
+    today = date.today()
+    rows = []
+    for i in range(count):
+        image = None
+        if image_bytes and rng.random() < image_ratio:
+            image = "data:image/png;base64," + base64.b64encode(rng.randbytes(image_bytes)).decode("ascii")
+        topic = rng.choice(INGREDIENTS)
+        rows.append({
+            "user_id": 1,
+            "title": f"{topic}的处理技巧 #{i}",
+            "content": f"{topic}" + "挑选、清洗与保存的经验总结。" * rng.randint(2, 20),
+            "image": image,
+            "date": today - timedelta(days=rng.randint(0, 365)),
+            "created_at": now - timedelta(seconds=i),
+        })
+    return rows
+
+
+def _pantry_rows(rng, count):
+    rows = []
+    for i in range(count):
+        if rng.random() < 0.3:
+            name, item_type = rng.choice(SEASONINGS), "seasoning"
+        else:
+            name, item_type = rng.choice(INGREDIENTS), "ingredient"
+        rows.append({
+            "user_id": 1,
+            # 接口写入时按 (name, item_type) 去重，这里加序号保证行数可控
+            "name": f"{name}-{i}",
+            "item_type": item_type,
+            "quantity": f"{rng.randint(1, 10)}份",
+        })
+    return rows
+
+
+def seed(database, params=None, reset=True):
+    """
+    向 database 指定的 SQLite 文件写入压测数据，reset 为 True 时会先清空所有表
+    database 必须显式传入，避免误清空 app.py 默认的 cooking_app_final.db
+    params 为 DEFAULT_PARAMS 中的生成参数，写入完成后连同行数一起记录到 manifest
+    返回实际写入的行数
+    """
+    url = sqlite_url(database)
+    os.environ["DATABASE_URL"] = url
+    from app import app, db, Recipe, KnowledgeItem, PantryItem, seed_database
+
+    # app 在导入时读取 DATABASE_URL，若本进程已提前导入过 app，则上面的设置不会生效
+    if app.config["SQLALCHEMY_DATABASE_URI"] != url:
+        raise RuntimeError(f"app 已连接到 {app.config['SQLALCHEMY_DATABASE_URI']}，拒绝向非压测数据库写入数据")
+
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    rng = random.Random(params["seed"])
+
+    # 先删除旧 manifest，写入中途失败时不会留下与数据不符的记录
+    if os.path.exists(manifest_path(database)):
+        os.remove(manifest_path(database))
+
+    with app.app_context():
+        if reset:
+            db.drop_all()
+        db.create_all()
+        seed_database()
+
+        plan = [
+            (Recipe, _recipe_rows(rng, params["recipes"], params["recipe_unescaped_ratio"])),
+            (KnowledgeItem, _knowledge_rows(rng, params["knowledge"], params["image_ratio"], params["image_bytes"])),
+            (PantryItem, _pantry_rows(rng, params["pantry"])),
+        ]
+        written = {}
+        for model, rows in plan:
+            for batch in _batched(rows):
+                db.session.bulk_insert_mappings(model, batch)
+            db.session.commit()
+            written[model.__tablename__] = len(rows)
+
+    if reset:
+        _write_manifest(database, params, written)
+    return written
+
+
+def add_seed_arguments(parser, with_defaults=True):
+    """
+    注册生成参数；with_defaults 为 False 时未指定的参数取值为 None，
+    便于调用方区分用户显式传入的参数（见 params_from_args）
+    """
+    def default(key):
+        return DEFAULT_PARAMS[key] if with_defaults else None
+
+    parser.add_argument("--recipes", type=int, default=default("recipes"))
+    parser.add_argument("--knowledge", type=int, default=default("knowledge"))
+    parser.add_argument("--pantry", type=int, default=default("pantry"))
+    parser.add_argument("--seed", type=int, default=default("seed"), help="随机种子，保证多次运行数据一致")
+    parser.add_argument("--image-ratio", type=float, default=default("image_ratio"), help="带图片的知识条目比例")
+    parser.add_argument("--image-bytes", type=int, default=default("image_bytes"), help="每张图片的原始字节数")
+    parser.add_argument("--recipe-unescaped-ratio", type=float, default=default("recipe_unescaped_ratio"),
+                        help="食材以未转义中文写入的菜谱比例，默认 0 与 app.py 的写入格式一致")
+
+
+def params_from_args(args):
+    """返回命令行中取值不为 None 的生成参数"""
+    values = {key: getattr(args, key) for key in DEFAULT_PARAMS}
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def params_to_argv(params):
+    argv = []
+    for key, value in params.items():
+        argv += ["--" + key.replace("_", "-"), str(value)]
+    return argv
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成压测用数据库")
+    parser.add_argument("--database", default=os.path.join("bench", "results", "bench.db"))
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.database)), exist_ok=True)
+    written = seed(args.database, params_from_args(args))
+    print(f"数据已写入 {args.database}: {written}")
+
+
+if __name__ == "__main__":
+    main()
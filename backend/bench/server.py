@@ -0,0 +1,29 @@
+"""
+压测用后端启动脚本
+
+与 `python app.py` 的区别：关闭 debug 与自动重载（重载会额外 fork 进程，
+影响内存统计），开启多线程，并关闭访问日志。
+数据库与上游地址通过 DATABASE_URL / DOUBAO_API_URL 等环境变量指定。
+"""
+
+import argparse
+import logging
+
+from app import app, db, seed_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description="以压测模式启动后端")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    with app.app_context():
+        db.create_all()
+        seed_database()
+    app.run(host=args.host, port=args.port, debug=False, use_reloader=False, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
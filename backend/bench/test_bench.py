@@ -0,0 +1,216 @@
+"""
+压测套件中纯函数的单元测试（统计、结果对比与参数处理），不启动任何服务
+
+在 backend 目录下运行：
+  python -m unittest bench.test_bench
+"""
+
+import argparse
+import contextlib
+import io
+import unittest
+
+from bench import compare, seed_data
+from bench.run import inspect_recommend, inspect_storage_tips, percentile, print_summary, summarize
+
+
+def make_sample(latency_ms, status=200, error=False, results=None, degraded=False, size=10):
+    return {"latency_ms": latency_ms, "status": status, "bytes": size, "error": error,
+            "results": results, "degraded": degraded}
+
+
+def make_result(throughput=100.0, p50=10.0, p95=20.0, p99=30.0, error_rate=0.0, peak_rss_mb=50.0, **extra):
+    result = {
+        "throughput_rps": throughput,
+        "latency_ms": {"p50": p50, "p95": p95, "p99": p99},
+        "error_rate": error_rate,
+        "peak_rss_mb": peak_rss_mb,
+    }
+    result.update(extra)
+    return result
+
+
+def make_report(**scenarios):
+    return {"scenarios": scenarios}
+
+
+class PercentileTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(percentile([], 50))
+
+    def test_single_value(self):
+        for pct in (1, 50, 99, 100):
+            self.assertEqual(percentile([7.0], pct), 7.0)
+
+    def test_nearest_rank(self):
+        values = list(range(1, 11))
+        self.assertEqual(percentile(values, 50), 5)
+        self.assertEqual(percentile(values, 95), 10)
+        self.assertEqual(percentile(values, 99), 10)
+        self.assertEqual(percentile(values, 10), 1)
+
+    def test_nearest_rank_hundred(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+
+
+class SummarizeTest(unittest.TestCase):
+    def test_empty_samples(self):
+        result = summarize([], 0.0)
+        self.assertEqual(result["requests"], 0)
+        self.assertEqual(result["error_rate"], 0.0)
+        self.assertEqual(result["throughput_rps"], 0.0)
+        self.assertEqual(result["degraded_rate"], 0.0)
+        self.assertIsNone(result["non_empty_rate"])
+        self.assertIsNone(result["result_count_mean"])
+        for key in ("min", "mean", "p50", "p95", "p99", "max"):
+            self.assertIsNone(result["latency_ms"][key])
+
+    def test_print_summary_with_empty_scenario(self):
+        result = summarize([], 0.0)
+        result["peak_rss_mb"] = None
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            print_summary({"recommend": result})
+        self.assertIn("None", out.getvalue())
+
+    def test_counts_and_rates(self):
+        samples = [
+            make_sample(10.0, results=0),
+            make_sample(20.0, results=3),
+            make_sample(30.0, status=500, error=True),
+            make_sample(40.0, status=None, error=True, size=0),
+            make_sample(50.0, degraded=True),
+        ]
+        result = summarize(samples, 2.0)
+        self.assertEqual(result["requests"], 5)
+        self.assertEqual(result["errors"], 2)
+        self.assertEqual(result["error_rate"], 0.4)
+        self.assertEqual(result["throughput_rps"], 2.5)
+        self.assertEqual(result["latency_ms"]["p50"], 30.0)
+        self.assertEqual(result["latency_ms"]["max"], 50.0)
+        self.assertEqual(result["status_codes"], {"200": 3, "500": 1, "exception": 1})
+        self.assertEqual(result["degraded"], 1)
+        self.assertEqual(result["degraded_rate"], 0.2)
+        # 只统计带结果列表的样本
+        self.assertEqual(result["result_count_mean"], 1.5)
+        self.assertEqual(result["non_empty_rate"], 0.5)
+
+
+class InspectorTest(unittest.TestCase):
+    def test_recommend(self):
+        self.assertEqual(inspect_recommend([]), {"results": 0, "degraded": False})
+        self.assertEqual(inspect_recommend([{}, {}])["results"], 2)
+
+    def test_storage_tips(self):
+        ok = {"土豆": {"method": "冷藏", "duration": "3天"}}
+        fallback = dict(ok, 鸡蛋={"method": "暂无建议", "duration": "N/A"})
+        self.assertFalse(inspect_storage_tips(ok)["degraded"])
+        self.assertTrue(inspect_storage_tips(fallback)["degraded"])
+        self.assertFalse(inspect_storage_tips({})["degraded"])
+
+
+class ChangePctTest(unittest.TestCase):
+    def test_none(self):
+        self.assertIsNone(compare.change_pct(None, 1.0))
+        self.assertIsNone(compare.change_pct(1.0, None))
+        self.assertIsNone(compare.change_pct(None, 0.0, is_rate=True))
+
+    def test_relative(self):
+        self.assertAlmostEqual(compare.change_pct(100.0, 110.0), 10.0)
+        self.assertAlmostEqual(compare.change_pct(100.0, 50.0), -50.0)
+
+    def test_zero_baseline_relative(self):
+        self.assertEqual(compare.change_pct(0, 0), 0.0)
+        self.assertIsNone(compare.change_pct(0, 5.0))
+
+    def test_zero_baseline_rate(self):
+        self.assertAlmostEqual(compare.change_pct(0.0, 0.05, is_rate=True), 5.0)
+        self.assertAlmostEqual(compare.change_pct(0.1, 0.05, is_rate=True), -5.0)
+        self.assertEqual(compare.change_pct(0.0, 0.0, is_rate=True), 0.0)
+
+
+class CompareTest(unittest.TestCase):
+    def test_direction_and_units(self):
+        rows = compare.compare(
+            make_report(recommend=make_result(throughput=100.0, p95=20.0)),
+            make_report(recommend=make_result(throughput=80.0, p95=30.0)),
+        )["recommend"]
+        self.assertAlmostEqual(rows["throughput_rps"]["regression_pct"], 20.0)
+        self.assertAlmostEqual(rows["p95_ms"]["regression_pct"], 50.0)
+        self.assertEqual(rows["p95_ms"]["unit"], "%")
+        self.assertEqual(rows["error_rate"]["unit"], "pp")
+
+    def test_missing_metrics_are_none(self):
+        # 旧版结果文件没有 degraded_rate / non_empty_rate，peak_rss_mb 在非 Linux 平台为 None
+        rows = compare.compare(
+            make_report(recommend=make_result(peak_rss_mb=None)),
+            make_report(recommend=make_result(degraded_rate=0.5, non_empty_rate=1.0)),
+        )["recommend"]
+        for metric in ("degraded_rate", "non_empty_rate", "peak_rss_mb"):
+            self.assertIsNone(rows[metric]["change_pct"])
+            self.assertIsNone(rows[metric]["regression_pct"])
+
+    def test_informational_metric_not_gated(self):
+        rows = compare.compare(
+            make_report(recommend=make_result(non_empty_rate=1.0)),
+            make_report(recommend=make_result(non_empty_rate=0.0)),
+        )
+        self.assertAlmostEqual(rows["recommend"]["non_empty_rate"]["change_pct"], -100.0)
+        self.assertIsNone(rows["recommend"]["non_empty_rate"]["regression_pct"])
+        self.assertEqual(compare.find_regressions(rows, 0.0, 0.0), [])
+
+    def test_skips_scenarios_missing_from_candidate(self):
+        rows = compare.compare(make_report(recommend=make_result()), make_report())
+        self.assertEqual(rows, {})
+
+
+class FindRegressionsTest(unittest.TestCase):
+    def setUp(self):
+        self.rows = compare.compare(
+            make_report(storage_tips=make_result(error_rate=0.0, degraded_rate=0.0)),
+            make_report(storage_tips=make_result(p95=21.0, error_rate=0.05, degraded_rate=0.08)),
+        )
+
+    def flagged(self, regressions):
+        return {metric for _, metric, _, _ in regressions}
+
+    def test_rate_increase_from_zero_fails_with_default_threshold(self):
+        regressions = compare.find_regressions(self.rows, 10.0)
+        self.assertEqual(self.flagged(regressions), {"error_rate", "degraded_rate"})
+
+    def test_rate_threshold_is_independent_of_pct_threshold(self):
+        self.assertEqual(compare.find_regressions(self.rows, 10.0, 10.0), [])
+        self.assertEqual(self.flagged(compare.find_regressions(self.rows, 10.0, 6.0)), {"degraded_rate"})
+
+    def test_pct_threshold(self):
+        # p95 变差 5%
+        self.assertEqual(self.flagged(compare.find_regressions(self.rows, 4.0, None)), {"p95_ms"})
+        self.assertEqual(compare.find_regressions(self.rows, 6.0, None), [])
+
+    def test_disabled_thresholds(self):
+        self.assertEqual(compare.find_regressions(self.rows, None, None), [])
+
+
+class SeedParamsTest(unittest.TestCase):
+    def parse(self, argv, with_defaults):
+        parser = argparse.ArgumentParser()
+        seed_data.add_seed_arguments(parser, with_defaults=with_defaults)
+        return seed_data.params_from_args(parser.parse_args(argv))
+
+    def test_defaults(self):
+        self.assertEqual(self.parse([], True), seed_data.DEFAULT_PARAMS)
+        self.assertEqual(self.parse([], False), {})
+
+    def test_explicit_only(self):
+        self.assertEqual(self.parse(["--recipes", "3000", "--recipe-unescaped-ratio", "0.5"], False),
+                         {"recipes": 3000, "recipe_unescaped_ratio": 0.5})
+
+    def test_argv_round_trip(self):
+        params = dict(seed_data.DEFAULT_PARAMS, recipes=123, image_ratio=0.5)
+        self.assertEqual(self.parse(seed_data.params_to_argv(params), False), params)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,295 @@
+"""
+本地上游模拟服务
+
+模拟 app.py 依赖的三个外部接口，便于在离线环境下压测：
+  DOUBAO_API_URL       -> POST /api/v3/chat/completions
+  BAIDU_ASR_TOKEN_URL  -> POST /oauth/2.0/token
+  BAIDU_ASR_URL        -> POST /server_api
+
+延迟、错误率与流式输出均可配置。单独运行：
+  python -m bench.upstream_stub --port 8900 --doubao-latency-ms 300 --error-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DOUBAO_PATH = "/api/v3/chat/completions"
+BAIDU_TOKEN_PATH = "/oauth/2.0/token"
+BAIDU_ASR_PATH = "/server_api"
+STATS_PATH = "/__stats"
+
+DEFAULT_CONFIG = {
+    "doubao_latency_ms": 50,   # 豆包每次调用的基础延迟
+    "token_latency_ms": 10,    # 百度获取令牌的基础延迟
+    "asr_latency_ms": 80,      # 百度语音识别的基础延迟
+    "jitter_ms": 0,            # 在基础延迟上叠加 [0, jitter_ms] 的随机抖动
+    "error_rate": 0.0,         # 返回错误的概率
+    "error_status": 500,       # 豆包 / 令牌接口出错时的 HTTP 状态码
+    "stream": False,           # 非流式请求也以分块方式慢慢吐出响应体
+    "stream_chunks": 8,        # 流式输出的分块数量
+    "stream_chunk_delay_ms": 5,
+    "seed": None,
+}
+
+
+def _storage_tip(ingredient):
+    return {"method": f"{ingredient}宜冷藏保存，用保鲜袋密封", "duration": "3-5天"}
+
+
+def _recipe(ingredients):
+    return {
+        "name": "创意" + "".join(ingredients[:2]) + "拼盘",
+        "ingredients": ingredients,
+        "steps": "1. 洗净切块；2. 热锅下油翻炒；3. 调味出锅。",
+    }
+
+
+def _community_questions():
+    return ["三文鱼怎么做好吃？", "哪里可以买到亚洲调料？", "蔬菜怎么保存更久？", "肉类推荐做法？", "本地奶酪可以做什么菜？"]
+
+
+def build_doubao_content(payload):
+    """根据 app.py 中各接口的提示词，生成对应结构的模型输出（字符串形式的 JSON）"""
+    messages = payload.get("messages") or []
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    user = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+
+    if "保鲜" in system:
+        ingredient = user.split("“", 1)[-1].split("”", 1)[0] if "“" in user else "食材"
+        content = _storage_tip(ingredient)
+    elif "菜谱" in system:
+        inner = user.split("[", 1)[-1].split("]", 1)[0] if "[" in user else ""
+        content = _recipe([i.strip() for i in inner.split(",") if i.strip()])
+    else:
+        content = _community_questions()
+    return json.dumps(content, ensure_ascii=False)
+
+
+class UpstreamStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "UpstreamStub/1.0"
+
+    def log_message(self, format, *args):
+        # 压测时不输出访问日志，避免 I/O 干扰测量
+        pass
+
+    @property
+    def config(self):
+        return self.server.config
+
+    def _sleep(self, base_ms):
+        delay = base_ms + self.server.rng.uniform(0, self.config["jitter_ms"])
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _should_fail(self):
+        return self.config["error_rate"] > 0 and self.server.rng.random() < self.config["error_rate"]
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status, obj):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunked(self, content_type, pieces):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        delay = self.config["stream_chunk_delay_ms"] / 1000.0
+        for piece in pieces:
+            data = piece.encode("utf-8")
+            if not data:
+                continue
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+            if delay > 0:
+                time.sleep(delay)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _split(self, text):
+        n = max(1, self.config["stream_chunks"])
+        size = max(1, -(-len(text) // n))
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def do_GET(self):
+        if self.path == STATS_PATH:
+            self._send_json(200, self.server.snapshot_stats())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        body = self._read_body()
+        self.server.count(path)
+
+        if path == DOUBAO_PATH:
+            self._handle_doubao(body)
+        elif path == BAIDU_TOKEN_PATH:
+            self._handle_token()
+        elif path == BAIDU_ASR_PATH:
+            self._handle_asr(body)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _handle_doubao(self, body):
+        self._sleep(self.config["doubao_latency_ms"])
+        if self._should_fail():
+            self.server.count("errors")
+            self._send_json(self.config["error_status"], {"error": {"code": "InternalServiceError", "message": "stub injected error"}})
+            return
+
+        payload = json.loads(body or b"{}")
+        content = build_doubao_content(payload)
+        model = payload.get("model", "stub")
+        created = int(time.time())
+
+        if payload.get("stream"):
+            # 与豆包 / OpenAI 兼容的 SSE 流式格式
+            events = []
+            for piece in self._split(content):
+                chunk = {"id": "stub", "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": None}]}
+                events.append("data: " + json.dumps(chunk, ensure_ascii=False) + "\n\n")
+            events.append("data: [DONE]\n\n")
+            self._send_chunked("text/event-stream; charset=utf-8", events)
+            return
+
+        result = {
+            "id": "stub",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+        if self.config["stream"]:
+            self._send_chunked("application/json; charset=utf-8", self._split(json.dumps(result, ensure_ascii=False)))
+        else:
+            self._send_json(200, result)
+
+    def _handle_token(self):
+        self._sleep(self.config["token_latency_ms"])
+        if self._should_fail():
+            self.server.count("errors")
+            self._send_json(self.config["error_status"], {"error": "invalid_client", "error_description": "stub injected error"})
+            return
+        self._send_json(200, {"access_token": "stub-access-token", "expires_in": 2592000, "scope": "audio_voice_assistant_get"})
+
+    def _handle_asr(self, body):
+        self._sleep(self.config["asr_latency_ms"])
+        if self._should_fail():
+            # 百度语音识别出错时仍返回 200，通过 err_no 表示失败
+            self.server.count("errors")
+            self._send_json(200, {"err_no": 3301, "err_msg": "speech quality error.", "sn": "stub"})
+            return
+        self._send_json(200, {"err_no": 0, "err_msg": "success.", "sn": "stub", "result": ["土豆两个，西红柿三个"]})
+
+
+class UpstreamStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config=None):
+        super().__init__(address, UpstreamStubHandler)
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        self.rng = random.Random(self.config["seed"])
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key):
+        with self._stats_lock:
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def snapshot_stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+
+def upstream_env(base_url):
+    """返回让 app.py 指向模拟服务所需的环境变量"""
+    return {
+        "DOUBAO_API_URL": base_url + DOUBAO_PATH,
+        "DOUBAO_API_KEY": "stub-doubao-key",
+        "BAIDU_ASR_TOKEN_URL": base_url + BAIDU_TOKEN_PATH,
+        "BAIDU_ASR_URL": base_url + BAIDU_ASR_PATH,
+        "BAIDU_ASR_API_KEY": "stub-baidu-key",
+        "BAIDU_ASR_SECRET_KEY": "stub-baidu-secret",
+    }
+
+
+def start_in_thread(host="127.0.0.1", port=0, config=None):
+    """在后台线程中启动模拟服务，port=0 时自动分配端口"""
+    server = UpstreamStubServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, name="upstream-stub", daemon=True)
+    thread.start()
+    return server
+
+
+def add_config_arguments(parser):
+    parser.add_argument("--doubao-latency-ms", type=float, default=DEFAULT_CONFIG["doubao_latency_ms"])
+    parser.add_argument("--token-latency-ms", type=float, default=DEFAULT_CONFIG["token_latency_ms"])
+    parser.add_argument("--asr-latency-ms", type=float, default=DEFAULT_CONFIG["asr_latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_CONFIG["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"])
+    parser.add_argument("--error-status", type=int, default=DEFAULT_CONFIG["error_status"])
+    parser.add_argument("--stream", action="store_true", help="非流式请求也分块慢速返回")
+    parser.add_argument("--stream-chunks", type=int, default=DEFAULT_CONFIG["stream_chunks"])
+    parser.add_argument("--stream-chunk-delay-ms", type=float, default=DEFAULT_CONFIG["stream_chunk_delay_ms"])
+    parser.add_argument("--stub-seed", type=int, default=None)
+
+
+def config_from_args(args):
+    return {
+        "doubao_latency_ms": args.doubao_latency_ms,
+        "token_latency_ms": args.token_latency_ms,
+        "asr_latency_ms": args.asr_latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "error_status": args.error_status,
+        "stream": args.stream,
+        "stream_chunks": args.stream_chunks,
+        "stream_chunk_delay_ms": args.stream_chunk_delay_ms,
+        "seed": args.stub_seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="豆包 / 百度语音识别本地模拟服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = UpstreamStubServer((args.host, args.port), config_from_args(args))
+    print(f"上游模拟服务已启动: {server.base_url}")
+    for key, value in upstream_env(server.base_url).items():
+        print(f"  {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()